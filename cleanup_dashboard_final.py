@@ -3,105 +3,117 @@
 Final cleanup script to remove all remaining duplicate components from DashboardView.swift.
 """
 
-def remove_lines(lines, start_line, end_line):
-    """Remove lines from start_line to end_line (1-indexed, inclusive)."""
-    start_idx = start_line - 1
-    end_idx = end_line
-    return lines[:start_idx] + lines[end_idx:]
+import os
+import re
+
+# Read/write buffer size (128 KiB) - Python's 8 KiB default means thousands of tiny
+# syscalls for a multi-megabyte Swift file
+BUFFER_SIZE = 1 << 17
+
+# Number of lines, starting at a section's end marker, searched for its closing brace
+CLOSING_BRACE_WINDOW = 10
+
+# Section 1: Orphaned FamilyNotificationItem code
+# Starts with "case trend(TrendInsight)"
+# Ends with the "}" shortly after "private static func makeInitials"
+
+# Section 2: Sidebar components
+# Starts with "// MARK: - ACCOUNT SIDEBAR VIEW"
+# Ends with the "}" closing "fileprivate func initials(from name: String)"
+
+# Marker -> (section, whether it marks the start or the end of that section)
+MARKERS = {
+    "case trend(TrendInsight)": ("orphaned", "start"),
+    "private static func makeInitials": ("orphaned", "end"),
+    "// MARK: - ACCOUNT SIDEBAR VIEW": ("sidebar", "start"),
+    "fileprivate func initials(from name: String)": ("sidebar", "end"),
+}
+
+# Every marker in one pattern built from MARKERS, so each line costs a single search
+# however many markers are added, and the table stays the only place to list them
+MARKER_PATTERN = re.compile('|'.join(re.escape(marker) for marker in MARKERS))
 
 def main():
     input_file = "/Users/ramikaawach/Desktop/Miya/Miya Health/DashboardView.swift"
     output_file = "/Users/ramikaawach/Desktop/Miya/Miya Health/DashboardView_final.swift"
-    
-    with open(input_file, 'r') as f:
-        lines = f.readlines()
-    
-    print(f"Original file: {len(lines)} lines")
-    
-    # Remove sidebar components (lines 2033-3177 based on the MARK comment before AccountSidebarView)
-    # Line 2033 is "// MARK: - ACCOUNT SIDEBAR VIEW"
-    # We need to find where ManageMembersView ends
-    
-    # First, let's find the exact end of ManageMembersView by looking for the next significant marker
-    # Looking at line 3177, it should be around there
-    
-    # Remove orphaned FamilyNotificationItem code (lines 3191-3391)
-    # But after removing the sidebar section, line numbers will shift
-    
-    # Strategy: Remove in reverse order to preserve line numbers
-    # 1. First remove the orphaned code (3191-3391)
-    # 2. Then remove the sidebar section (2033-3177)
-    
-    # Let's be more precise - find the closing brace of ManageMembersView
-    # and the orphaned code section
-    
-    # Section 1: Orphaned FamilyNotificationItem code
-    # Starts at line 3191 with "case trend(TrendInsight)"
-    # Ends at line 3391 with "}"
-    
-    # Section 2: Sidebar components
-    # Starts at line 2033 with "// MARK: - ACCOUNT SIDEBAR VIEW"
-    # Need to find where it ends - should be right before the orphaned code
-    
-    # Let's look for the "fileprivate func initials" which appears to be at line 3171
-    # So sidebar section is lines 2033-3177
-    
-    # Actually, let me search for these markers in the file
-    orphaned_start = None
-    orphaned_end = None
-    sidebar_start = None
-    sidebar_end = None
-    
-    for i, line in enumerate(lines):
-        if "case trend(TrendInsight)" in line and orphaned_start is None:
-            orphaned_start = i + 1  # Convert to 1-indexed
-            print(f"Found orphaned code start at line {orphaned_start}")
-        
-        if orphaned_start and "private static func makeInitials" in line and orphaned_end is None:
-            # Find the closing brace of this orphaned section
-            # It should be a few lines after makeInitials
-            for j in range(i, min(i + 10, len(lines))):
-                if lines[j].strip() == "}":
-                    orphaned_end = j + 1  # Convert to 1-indexed
-                    print(f"Found orphaned code end at line {orphaned_end}")
-                    break
-        
-        if "// MARK: - ACCOUNT SIDEBAR VIEW" in line and sidebar_start is None:
-            sidebar_start = i + 1  # Convert to 1-indexed
-            print(f"Found sidebar start at line {sidebar_start}")
-        
-        if sidebar_start and "fileprivate func initials(from name: String)" in line and sidebar_end is None:
-            # Find the closing brace of this function
-            for j in range(i, min(i + 10, len(lines))):
-                if lines[j].strip() == "}":
-                    sidebar_end = j + 1  # Convert to 1-indexed
-                    print(f"Found sidebar end at line {sidebar_end}")
-                    break
-    
-    if not all([orphaned_start, orphaned_end, sidebar_start, sidebar_end]):
+
+    sections = {
+        "orphaned": {"label": "orphaned code", "start": None, "end": None},
+        "sidebar": {"label": "sidebar", "start": None, "end": None},
+    }
+
+    # Sections whose lines are currently being skipped
+    active = set()
+    # Section -> last line (1-indexed) that may hold its closing brace, once its end marker is seen
+    deadlines = {}
+
+    line_no = 0
+    output_lines = 0
+
+    # The file is streamed once: every line outside the two sections is written straight
+    # to a temporary file next to the output, so only the section boundaries are kept in
+    # memory and an existing output file is only replaced once both sections are found.
+    # (A plain open() rather than tempfile, so the result gets the usual file permissions.)
+    temp_file = output_file + ".tmp"
+    with open(input_file, 'r', buffering=BUFFER_SIZE) as f, \
+            open(temp_file, 'w', buffering=BUFFER_SIZE) as out:
+        try:
+            for line_no, line in enumerate(f, 1):
+                match = MARKER_PATTERN.search(line)
+                if match:
+                    key, boundary = MARKERS[match.group(0)]
+                    section = sections[key]
+                    if boundary == "start" and section["start"] is None:
+                        section["start"] = line_no
+                        active.add(key)
+                        print(f"Found {section['label']} start at line {line_no}")
+                    elif boundary == "end" and section["start"] and section["end"] is None:
+                        deadlines[key] = line_no + CLOSING_BRACE_WINDOW - 1
+
+                closed = []
+                if deadlines:
+                    is_closing_brace = line.strip() == "}"
+                    for key, deadline in list(deadlines.items()):
+                        if is_closing_brace:
+                            sections[key]["end"] = line_no
+                            closed.append(key)
+                            del deadlines[key]
+                            print(f"Found {sections[key]['label']} end at line {line_no}")
+                        elif line_no >= deadline:
+                            del deadlines[key]
+
+                if active:
+                    # The closing brace itself is still part of the section
+                    active.difference_update(closed)
+                else:
+                    out.write(line)
+                    output_lines += 1
+        except BaseException:
+            # Don't leave a half-written temporary file behind
+            out.close()
+            os.remove(temp_file)
+            raise
+
+    # Counted during the single pass - no second read of the input just to size it
+    original_lines = line_no
+
+    if not all(section["start"] and section["end"] for section in sections.values()):
+        # Leave any existing output untouched - only the temporary file is discarded
+        os.remove(temp_file)
         print("ERROR: Could not find all sections")
-        print(f"orphaned_start={orphaned_start}, orphaned_end={orphaned_end}")
-        print(f"sidebar_start={sidebar_start}, sidebar_end={sidebar_end}")
+        for key, section in sections.items():
+            print(f"{key}_start={section['start']}, {key}_end={section['end']}")
         return
-    
-    # Remove in reverse order to preserve line numbers
-    print(f"\nRemoving orphaned code (lines {orphaned_start}-{orphaned_end}): {orphaned_end - orphaned_start + 1} lines")
-    lines = remove_lines(lines, orphaned_start, orphaned_end)
-    
-    # Adjust sidebar_end since we removed lines before it
-    lines_removed = orphaned_end - orphaned_start + 1
-    if sidebar_end > orphaned_start:
-        sidebar_end -= lines_removed
-    
-    print(f"Removing sidebar section (lines {sidebar_start}-{sidebar_end}): {sidebar_end - sidebar_start + 1} lines")
-    lines = remove_lines(lines, sidebar_start, sidebar_end)
-    
-    # Write output
-    with open(output_file, 'w') as f:
-        f.writelines(lines)
-    
-    print(f"\nFinal file: {len(lines)} lines")
-    print(f"Total removed: {len(open(input_file).readlines()) - len(lines)} lines")
+
+    os.replace(temp_file, output_file)
+
+    print(f"Original file: {original_lines} lines")
+    print()
+    for section in sections.values():
+        print(f"Removed {section['label']} (lines {section['start']}-{section['end']}): {section['end'] - section['start'] + 1} lines")
+
+    print(f"\nFinal file: {output_lines} lines")
+    print(f"Total removed: {original_lines - output_lines} lines")
     print(f"\nOutput written to: {output_file}")
 
 if __name__ == "__main__":
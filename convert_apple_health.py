@@ -5,12 +5,111 @@ Usage: python convert_apple_health.py export.xml
 Output: vitality_data.csv
 """
 
-from extractor import Extractor
+import xml.etree.ElementTree as ET
 import csv
 from datetime import datetime
 from collections import defaultdict
 import sys
 
+SLEEP_TYPE = "HKCategoryTypeIdentifierSleepAnalysis"
+STEPS_TYPE = "HKQuantityTypeIdentifierStepCount"
+HRV_TYPE = "HKQuantityTypeIdentifierHeartRateVariabilitySDNN"
+RESTING_HR_TYPE = "HKQuantityTypeIdentifierRestingHeartRate"
+
+# Chunk size for feeding the export to the XML parser (1 MiB)
+READ_SIZE = 1 << 20
+
+# CSV write buffer size (128 KiB) - fewer write syscalls than the 8 KiB default for multi-year exports
+BUFFER_SIZE = 1 << 17
+
+def new_day():
+    """Running totals for one day; averages are kept as (sum, count) until the end."""
+    return {'sleep': 0.0, 'steps': 0.0, 'hrv_sum': 0.0, 'hrv_n': 0, 'resting_hr_sum': 0.0, 'resting_hr_n': 0}
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+class RecordAggregator:
+    """
+    XMLParser target that aggregates each metric by day as expat reports <Record> start
+    tags. No Element objects or iterparse events are created for the (often millions of)
+    records in an export, and memory grows with the number of days, not records.
+    """
+
+    def __init__(self):
+        self.record_types = set()
+        self.record_counts = {SLEEP_TYPE: 0, STEPS_TYPE: 0, HRV_TYPE: 0, RESTING_HR_TYPE: 0}
+        self.daily_data = defaultdict(new_day)
+
+    def start(self, tag, attrib):
+        if tag != 'Record':
+            return
+
+        record_type = attrib.get('type')
+        self.record_types.add(record_type)
+
+        record_counts = self.record_counts
+        if record_type in record_counts:
+            record_counts[record_type] += 1
+
+            # Read each attribute and slice the date once per record
+            start_date = attrib.get('startDate')
+            value = attrib.get('value', 0)
+
+            # Process sleep (sum hours per day, only asleep time)
+            if record_type == SLEEP_TYPE:
+                if value == 'HKCategoryValueSleepAnalysisAsleep':
+                    start = parse_timestamp(start_date)
+                    end = parse_timestamp(attrib.get('endDate'))
+                    self.daily_data[start_date[:10]]['sleep'] += (end - start).total_seconds() / 3600
+
+            else:
+                day = self.daily_data[start_date[:10]]
+                value = float(value)
+
+                # Process steps (sum per day)
+                if record_type == STEPS_TYPE:
+                    day['steps'] += value
+
+                # Process HRV (average per day)
+                elif record_type == HRV_TYPE:
+                    day['hrv_sum'] += value
+                    day['hrv_n'] += 1
+
+                # Process resting HR (average per day)
+                else:
+                    day['resting_hr_sum'] += value
+                    day['resting_hr_n'] += 1
+
+    def close(self):
+        return self.record_types, self.record_counts, self.daily_data
+
+def aggregate_records(xml_file):
+    """
+    Stream the export once and aggregate each metric by day as records are read.
+    Returns (record_types, record_counts, daily_data); daily_data maps date -> new_day().
+    """
+    parser = ET.XMLParser(target=RecordAggregator())
+    with open(xml_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_SIZE), b''):
+            parser.feed(chunk)
+    return parser.close()
+
+def csv_rows(daily_data):
+    """Yield (date, sleep_hours, steps, hrv_ms, resting_hr) for each day with data, in date order."""
+    for date in sorted(daily_data):
+        data = daily_data[date]
+        sleep_hrs = round(data['sleep'], 1) if data['sleep'] > 0 else ''
+        steps = int(data['steps']) if data['steps'] > 0 else ''
+
+        # Only write rows with at least some data - decided before the averages are computed
+        if not (sleep_hrs or steps):
+            continue
+
+        hrv = round(data['hrv_sum'] / data['hrv_n'], 1) if data['hrv_n'] else ''
+        rhr = round(data['resting_hr_sum'] / data['resting_hr_n'], 1) if data['resting_hr_n'] else ''
+        yield (date, sleep_hrs, steps, hrv, rhr)
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python convert_apple_health.py <export.xml>")
@@ -18,76 +117,30 @@ def main():
     
     xml_file = sys.argv[1]
     
-    # Load Apple Health XML
+    # Read and aggregate Apple Health XML (single streaming pass)
     print(f"Loading {xml_file}...")
-    extractor = Extractor(xml_file)
+    record_types, record_counts, daily_data = aggregate_records(xml_file)
     
-    # Get available record types
+    # Show available record types
     print("\nAvailable record types:")
-    record_types = extractor.get_record_types()
-    health_types = [rt for rt in record_types if any(keyword in rt for keyword in ['Sleep', 'Steps', 'HeartRate', 'Variability'])]
+    health_types = [rt for rt in sorted(record_types) if any(keyword in rt for keyword in ['Sleep', 'Steps', 'HeartRate', 'Variability'])]
     for rt in health_types:
         print(f"  - {rt}")
     
-    # Extract metrics
+    # Extracted metrics
     print("\nExtracting metrics...")
-    sleep_records = extractor.get_records("HKCategoryTypeIdentifierSleepAnalysis")
-    steps_records = extractor.get_records("HKQuantityTypeIdentifierStepCount")
-    hrv_records = extractor.get_records("HKQuantityTypeIdentifierHeartRateVariabilitySDNN")
-    resting_hr_records = extractor.get_records("HKQuantityTypeIdentifierRestingHeartRate")
-    
-    print(f"  Sleep records: {len(sleep_records)}")
-    print(f"  Steps records: {len(steps_records)}")
-    print(f"  HRV records: {len(hrv_records)}")
-    print(f"  Resting HR records: {len(resting_hr_records)}")
-    
-    # Aggregate by date
-    daily_data = defaultdict(lambda: {'sleep': 0, 'steps': 0, 'hrv': [], 'resting_hr': []})
-    
-    # Process sleep (sum hours per day, only asleep time)
-    for record in sleep_records:
-        if record.get('value') == 'HKCategoryValueSleepAnalysisAsleep':
-            date = record['startDate'][:10]
-            start = datetime.fromisoformat(record['startDate'].replace('Z', '+00:00'))
-            end = datetime.fromisoformat(record['endDate'].replace('Z', '+00:00'))
-            hours = (end - start).total_seconds() / 3600
-            daily_data[date]['sleep'] += hours
-    
-    # Process steps (sum per day)
-    for record in steps_records:
-        date = record['startDate'][:10]
-        steps = float(record.get('value', 0))
-        daily_data[date]['steps'] += steps
-    
-    # Process HRV (average per day)
-    for record in hrv_records:
-        date = record['startDate'][:10]
-        hrv = float(record.get('value', 0))
-        daily_data[date]['hrv'].append(hrv)
-    
-    # Process resting HR (average per day)
-    for record in resting_hr_records:
-        date = record['startDate'][:10]
-        rhr = float(record.get('value', 0))
-        daily_data[date]['resting_hr'].append(rhr)
+    print(f"  Sleep records: {record_counts[SLEEP_TYPE]}")
+    print(f"  Steps records: {record_counts[STEPS_TYPE]}")
+    print(f"  HRV records: {record_counts[HRV_TYPE]}")
+    print(f"  Resting HR records: {record_counts[RESTING_HR_TYPE]}")
     
     # Write to CSV
     output_file = 'vitality_data.csv'
     print(f"\nWriting to {output_file}...")
-    with open(output_file, 'w', newline='') as f:
+    with open(output_file, 'w', newline='', buffering=BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow(['date', 'sleep_hours', 'steps', 'hrv_ms', 'resting_hr'])
-        
-        for date in sorted(daily_data.keys()):
-            data = daily_data[date]
-            sleep_hrs = round(data['sleep'], 1) if data['sleep'] > 0 else ''
-            steps = int(data['steps']) if data['steps'] > 0 else ''
-            hrv = round(sum(data['hrv']) / len(data['hrv']), 1) if data['hrv'] else ''
-            rhr = round(sum(data['resting_hr']) / len(data['resting_hr']), 1) if data['resting_hr'] else ''
-            
-            # Only write rows with at least some data
-            if sleep_hrs or steps:
-                writer.writerow([date, sleep_hrs, steps, hrv, rhr])
+        writer.writerows(csv_rows(daily_data))
     
     print(f"✅ Done! Created {output_file}")
     print("\nTo use in Miya:")
@@ -98,4 +151,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-